@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Pipeline Artifact Store
+───────────────────────
+Content-addressed, compressed storage for every stage input and
+output the pipeline produces, with a small SQLite index so runs can
+be listed, compared and reused.
+
+Content is split into line-aligned, content-defined chunks; each
+chunk is stored once as a compressed blob named by its SHA-256, so
+text shared between stages and runs (chapter text, Scholar JSON
+embedded in later prompts, unchanged agent prompts) costs nothing
+extra on disk. Blobs use zstd when the `zstandard` package is
+installed and gzip otherwise.
+
+Usage:
+  python3 artifacts.py list --chapter 11
+  python3 artifacts.py show 42
+  python3 artifacts.py gc --keep-runs 50
+  python3 artifacts.py stats
+
+Options:
+  --root      Store directory (default: artifacts)
+"""
+
+import argparse
+import gzip
+import hashlib
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARTIFACTS_ROOT = "artifacts"
+CHUNK_MIN      = 2 * 1024       # never cut a chunk smaller than this…
+CHUNK_MAX      = 64 * 1024      # …or let one grow past this
+CHUNK_MASK     = 0x1F           # cut after lines whose hash ends in 5 zero bits
+GC_GRACE       = 3600           # gc leaves blobs younger than this (seconds) alone
+
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def prompt_hash(text):
+    """Short stable hash used to group artifacts by prompt version."""
+    return digest(text.encode('utf-8'))[:16]
+
+
+def chunk(data):
+    """Split bytes into content-defined chunks at line boundaries.
+
+    Boundaries depend only on the lines themselves, so a block of text
+    embedded in two different documents produces the same chunks in
+    both once the boundaries resynchronize.
+    """
+    chunks, start, pos = [], 0, 0
+    for line in data.splitlines(keepends=True):
+        pos += len(line)
+        size = pos - start
+        if size >= CHUNK_MAX or (size >= CHUNK_MIN and
+                                 hashlib.blake2b(line, digest_size=4).digest()[0] & CHUNK_MASK == 0):
+            chunks.append(data[start:pos])
+            start = pos
+    if start < len(data):
+        chunks.append(data[start:])
+    return chunks
+
+
+def compress(data):
+    if zstandard:
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def decompress(blob):
+    if blob.startswith(_ZSTD_MAGIC):
+        if not zstandard:
+            raise RuntimeError("Blob is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return gzip.decompress(blob)
+
+
+class ArtifactStore:
+    """Content-addressed store of pipeline stage inputs and outputs."""
+
+    def __init__(self, root=ARTIFACTS_ROOT):
+        self.root = root
+        self.blob_dir = os.path.join(root, 'blobs')
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(root, 'index.db'))
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS artifacts (
+                id          INTEGER PRIMARY KEY,
+                run_id      TEXT    NOT NULL,
+                chapter     TEXT    NOT NULL,
+                stage       TEXT    NOT NULL,
+                kind        TEXT    NOT NULL,
+                prompt_hash TEXT,
+                digest      TEXT    NOT NULL,
+                size        INTEGER NOT NULL,
+                created     REAL    NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                artifact_id INTEGER NOT NULL,
+                seq         INTEGER NOT NULL,
+                chunk       TEXT    NOT NULL,
+                PRIMARY KEY (artifact_id, seq)
+            );
+            CREATE INDEX IF NOT EXISTS artifacts_chapter ON artifacts (chapter, stage, created);
+            CREATE INDEX IF NOT EXISTS artifacts_prompt  ON artifacts (prompt_hash);
+            CREATE INDEX IF NOT EXISTS artifacts_run     ON artifacts (run_id);
+            CREATE INDEX IF NOT EXISTS artifacts_digest  ON artifacts (digest);
+            CREATE INDEX IF NOT EXISTS chunks_chunk      ON chunks (chunk);
+        """)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _blob_path(self, key):
+        return os.path.join(self.blob_dir, key[:2], key[2:])
+
+    # ── Writing ──────────────────────────────────
+    def put(self, run_id, chapter, stage, kind, content, prompt_hash=None):
+        """Store one stage input/output and return its artifact id."""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        keys = []
+        for piece in chunk(data):
+            key  = digest(piece)
+            path = self._blob_path(key)
+            try:
+                # Reused blob: refresh its mtime so a concurrent gc() that
+                # read its live set before this put commits still spares it
+                os.utime(path)
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Unique per writer: batch threads often store the same chunk at once
+                fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(compress(piece))
+                os.replace(tmp, path)
+            keys.append(key)
+
+        with self.db:
+            cur = self.db.execute(
+                "INSERT INTO artifacts (run_id, chapter, stage, kind, prompt_hash, digest, size, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, str(chapter), stage, kind, prompt_hash, digest(data), len(data), time.time()))
+            self.db.executemany(
+                "INSERT INTO chunks (artifact_id, seq, chunk) VALUES (?, ?, ?)",
+                [(cur.lastrowid, seq, key) for seq, key in enumerate(keys)])
+        return cur.lastrowid
+
+    def run(self, chapter, run_id=None):
+        """Return a recorder bound to one pipeline run of one chapter."""
+        return Run(self, chapter, run_id)
+
+    # ── Reading ──────────────────────────────────
+    def get(self, artifact_id):
+        """Reassemble an artifact's content as text."""
+        row = self.db.execute("SELECT size FROM artifacts WHERE id = ?", (artifact_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No artifact {artifact_id}")
+        if row['size'] == 0:
+            return ''
+        keys = [r['chunk'] for r in self.db.execute(
+            "SELECT chunk FROM chunks WHERE artifact_id = ? ORDER BY seq", (artifact_id,))]
+        parts = []
+        for key in keys:
+            with open(self._blob_path(key), 'rb') as f:
+                parts.append(decompress(f.read()))
+        return b''.join(parts).decode('utf-8')
+
+    def list(self, chapter=None, stage=None, kind=None, prompt_hash=None, run_id=None, limit=50):
+        """Newest-first artifact metadata, optionally filtered."""
+        where, params = [], []
+        for column, value in (('chapter', chapter), ('stage', stage), ('kind', kind),
+                              ('prompt_hash', prompt_hash), ('run_id', run_id)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(str(value))
+        sql = "SELECT * FROM artifacts"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created DESC, id DESC LIMIT ?"
+        return [dict(r) for r in self.db.execute(sql, (*params, limit))]
+
+    def latest(self, chapter, stage, kind='output', prompt_hash=None):
+        """Content of the most recent matching artifact, or None."""
+        rows = self.list(chapter=chapter, stage=stage, kind=kind, prompt_hash=prompt_hash, limit=1)
+        return self.get(rows[0]['id']) if rows else None
+
+    def stats(self):
+        logical = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts").fetchone()
+        runs    = self.db.execute("SELECT COUNT(DISTINCT run_id) FROM artifacts").fetchone()[0]
+        blobs, on_disk = 0, 0
+        for dirpath, _, files in os.walk(self.blob_dir):
+            for name in files:
+                blobs   += 1
+                on_disk += os.path.getsize(os.path.join(dirpath, name))
+        return {'runs': runs, 'artifacts': logical[0], 'logicalBytes': logical[1],
+                'blobs': blobs, 'diskBytes': on_disk}
+
+    # ── Garbage collection ───────────────────────
+    def gc(self, keep_runs=None, older_than_days=None, grace=GC_GRACE):
+        """Drop old runs, then delete blobs no artifact references.
+
+        Temp files and blobs written or reused less than `grace` seconds ago
+        are kept, since they may belong to a put() whose index rows aren't
+        committed yet.
+        Returns (artifacts removed, blobs removed).
+        """
+        doomed = set()
+        if keep_runs is not None:
+            runs = [r[0] for r in self.db.execute(
+                "SELECT run_id FROM artifacts GROUP BY run_id ORDER BY MAX(created) DESC")]
+            doomed.update(runs[keep_runs:])
+        if older_than_days is not None:
+            cutoff = time.time() - older_than_days * 86400
+            doomed.update(r[0] for r in self.db.execute(
+                "SELECT run_id FROM artifacts GROUP BY run_id HAVING MAX(created) < ?", (cutoff,)))
+
+        removed = 0
+        with self.db:
+            for run_id in doomed:
+                ids = [(r[0],) for r in self.db.execute(
+                    "SELECT id FROM artifacts WHERE run_id = ?", (run_id,))]
+                self.db.executemany("DELETE FROM chunks WHERE artifact_id = ?", ids)
+                self.db.execute("DELETE FROM artifacts WHERE run_id = ?", (run_id,))
+                removed += len(ids)
+
+        live   = {r[0] for r in self.db.execute("SELECT DISTINCT chunk FROM chunks")}
+        cutoff = time.time() - grace
+        swept  = 0
+        for dirpath, _, files in os.walk(self.blob_dir):
+            for name in files:
+                path = os.path.join(dirpath, name)
+                key  = os.path.basename(dirpath) + name
+                if name.endswith('.tmp') or key in live or os.path.getmtime(path) > cutoff:
+                    continue
+                os.remove(path)
+                swept += 1
+        return removed, swept
+
+
+class Run:
+    """Recorder for one pipeline run; tags every artifact with run and chapter."""
+
+    def __init__(self, store, chapter, run_id=None):
+        self.store   = store
+        self.chapter = str(chapter)
+        self.run_id  = run_id or f"{time.strftime('%Y%m%d-%H%M%S')}-ch{self.chapter}-{uuid.uuid4().hex[:6]}"
+
+    def put(self, stage, kind, content, prompt_hash=None):
+        return self.store.put(self.run_id, self.chapter, stage, kind, content, prompt_hash)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Inspect the pipeline artifact store')
+    parser.add_argument('command', choices=['list', 'show', 'gc', 'stats'])
+    parser.add_argument('id', nargs='?', type=int, help='Artifact id (for show)')
+    parser.add_argument('--root',      default=ARTIFACTS_ROOT, help='Store directory')
+    parser.add_argument('--chapter',   default=None)
+    parser.add_argument('--stage',     default=None)
+    parser.add_argument('--kind',      default=None)
+    parser.add_argument('--prompt',    default=None, help='Prompt hash')
+    parser.add_argument('--run',       default=None, help='Run id')
+    parser.add_argument('--limit',     type=int, default=50)
+    parser.add_argument('--keep-runs', type=int, default=None)
+    parser.add_argument('--days',      type=int, default=None, help='Drop runs older than this')
+
+    args = parser.parse_args()
+
+    with ArtifactStore(args.root) as store:
+        if args.command == 'list':
+            for a in store.list(args.chapter, args.stage, args.kind, args.prompt, args.run, args.limit):
+                when = time.strftime('%Y-%m-%d %H:%M', time.localtime(a['created']))
+                print(f"  {a['id']:>6}  {when}  ch{a['chapter']:<6} {a['stage']:<12} {a['kind']:<7} "
+                      f"{a['prompt_hash'] or '-':<16}  {a['size']:>9,} B  {a['run_id']}")
+
+        elif args.command == 'show':
+            if args.id is None:
+                print("❌ Usage: python3 artifacts.py show <id>")
+                sys.exit(1)
+            print(store.get(args.id))
+
+        elif args.command == 'gc':
+            if args.keep_runs is None and args.days is None:
+                print("❌ Pass --keep-runs and/or --days")
+                sys.exit(1)
+            removed, swept = store.gc(args.keep_runs, args.days)
+            print(f"🧹 Removed {removed} artifacts and {swept} unreferenced blobs")
+
+        else:
+            s = store.stats()
+            ratio = s['logicalBytes'] / s['diskBytes'] if s['diskBytes'] else 0
+            print(f"📦 {s['runs']} runs · {s['artifacts']:,} artifacts · "
+                  f"{s['logicalBytes']:,} B stored as {s['blobs']:,} blobs ({s['diskBytes']:,} B, {ratio:.1f}×)")
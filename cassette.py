@@ -0,0 +1,120 @@
+"""
+Record / Replay Cassettes
+─────────────────────────
+Captures every agent request and response of a pipeline run into a
+cassette file (--record), then serves those responses from disk
+(--replay) so downstream changes can be tested offline and instantly.
+
+Each line of a cassette is one JSON exchange:
+  {"chapter", "stage", "requestHash", "systemHash", "messagesHash", "model", "response"}
+
+Replay matches on the full request hash first. If nothing matches
+(a prompt file or an upstream output changed) it falls back to the
+next unused exchange for the same chapter and stage, in recorded
+order, and records the drift so it can be reported at the end of the
+run. Keying the fallback by chapter keeps batch replays deterministic
+even though chapters run on concurrent threads.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+
+def _hash(value):
+    blob = json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+def request_hashes(request):
+    """Hashes of the whole request and of its system prompt / messages."""
+    return {
+        'requestHash':  _hash(request),
+        'systemHash':   _hash(request.get('system', '')),
+        'messagesHash': _hash(request.get('messages', [])),
+    }
+
+
+def _chapter(chapter):
+    return None if chapter is None else str(chapter)
+
+
+class CassetteExhausted(Exception):
+    """Replay asked for more exchanges than the cassette holds."""
+
+
+class Cassette:
+    """A recorded sequence of agent exchanges, in record or replay mode."""
+
+    def __init__(self, path, mode):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path  = path
+        self.mode  = mode
+        self.drift = []
+        self._lock = threading.Lock()
+
+        if mode == 'record':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            open(path, 'w').close()
+            self.entries = []
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = [json.loads(line) for line in f if line.strip()]
+        self._used = [False] * len(self.entries)
+
+    @property
+    def replaying(self):
+        return self.mode == 'replay'
+
+    def record(self, stage, request, response_text, chapter=None):
+        """Append one exchange to the cassette file."""
+        entry = {'chapter': _chapter(chapter), 'stage': stage, **request_hashes(request),
+                 'model': request.get('model'), 'response': response_text}
+        with self._lock:
+            self.entries.append(entry)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def replay(self, stage, request, chapter=None):
+        """Return the recorded response text for this request."""
+        hashes  = request_hashes(request)
+        chapter = _chapter(chapter)
+        with self._lock:
+            index = next((i for i, e in enumerate(self.entries)
+                          if not self._used[i] and e['requestHash'] == hashes['requestHash']), None)
+            if index is None:
+                index = next((i for i, e in enumerate(self.entries)
+                              if not self._used[i] and e['stage'] == stage
+                              and e.get('chapter') == chapter), None)
+                if index is None:
+                    raise CassetteExhausted(f"No recorded {stage} exchange for chapter {chapter} "
+                                            f"left in {self.path}")
+                recorded = self.entries[index]
+                changed = [part for part, key in (('system prompt', 'systemHash'),
+                                                  ('input', 'messagesHash'))
+                           if recorded[key] != hashes[key]]
+                if recorded.get('model') != request.get('model'):
+                    changed.append('model')
+                self.drift.append({'chapter': chapter, 'stage': stage, 'exchange': index,
+                                   'changed': changed})
+            self._used[index] = True
+            return self.entries[index]['response']
+
+    def report(self):
+        """Print a summary of prompt drift seen during replay."""
+        if not self.replaying:
+            print(f"📼 Recorded {len(self.entries)} exchanges to {self.path}")
+            return
+        unused = self._used.count(False)
+        if not self.drift:
+            print(f"📼 Replayed {self._used.count(True)} exchanges from {self.path} — no prompt drift")
+        else:
+            print(f"📼 Replayed {self._used.count(True)} exchanges from {self.path} — "
+                  f"{len(self.drift)} drifted from the recording:")
+            for d in self.drift:
+                print(f"   ⚠️  Ch {d['chapter']} {d['stage']} (exchange {d['exchange'] + 1}): "
+                      f"{', '.join(d['changed']) or 'request'} changed")
+        if unused:
+            print(f"   {unused} recorded exchanges were not used")
@@ -0,0 +1,179 @@
+"""
+Course Corpus Loader
+────────────────────
+Opens the source texts for a course (the book plus optional
+instructor notes, case studies, …) as memory-mapped files and decodes
+only the byte ranges the pipeline asks for, so memory stays flat as the
+corpus grows and concurrent workers share the same pages.
+
+A corpus is one of:
+  book.txt                a single source text
+  corpus/                 a directory — book.txt (or the first file) is
+                          the book, every other .txt/.md is supplementary
+  corpus/bus370.json      a per-course config:
+
+    {
+      "name":    "BUS 370 — Sales EQ",
+      "book":    "book.txt",
+      "sources": [
+        {"path": "notes/instructor_notes.md", "label": "Instructor notes"},
+        {"path": "case_studies/",             "label": "Case studies"}
+      ]
+    }
+
+Paths in a config are relative to the config file.
+"""
+
+import json
+import mmap
+import os
+import re
+import threading
+
+TEXT_SUFFIXES = ('.txt', '.md')
+
+_HEADER = re.compile(rb'(?im)^[ \t]*chapter ')
+
+
+class Source:
+    """One memory-mapped source text."""
+
+    def __init__(self, path, label=None):
+        self.path  = path
+        self.label = label or os.path.splitext(os.path.basename(path))[0].replace('_', ' ')
+        self.size  = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            # mmap can't map empty files
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+
+    def text(self, start=0, end=None):
+        """Decode bytes [start, end) of the source."""
+        return self.data[start:end].decode('utf-8', errors='replace')
+
+    def head(self, chars):
+        """First `chars` characters, decoding at most 4 bytes per character."""
+        return self.data[:chars * 4].decode('utf-8', errors='ignore')[:chars]
+
+    def chapter_range(self, chapter, max_lines=500):
+        """Byte range of the chapter(s), or None if no heading matches.
+
+        Same rules as the original line-by-line scan: start at the first
+        line mentioning "chapter N" and stop before the next line that
+        begins with "chapter " (or after `max_lines` lines).
+        """
+        names = {str(chapter), str(chapter).replace('-', '–')}
+        wanted = re.compile(b'(?i)' + b'|'.join(re.escape(f'chapter {n}'.encode('utf-8')) for n in names))
+        data = self.data
+
+        found = wanted.search(data)
+        if not found:
+            return None
+        start = data.rfind(b'\n', 0, found.start()) + 1
+
+        pos = data.find(b'\n', found.end())
+        while pos != -1:
+            header = _HEADER.search(data, pos + 1)
+            if not header:
+                break
+            line_end = data.find(b'\n', header.start())
+            line_end = len(data) if line_end == -1 else line_end
+            if not wanted.search(data, header.start(), line_end):
+                return start, header.start() - 1
+            pos = line_end if line_end < len(data) else -1
+
+        # No following heading — take a fixed number of lines
+        end = start
+        for _ in range(max_lines):
+            nl = data.find(b'\n', end)
+            if nl == -1:
+                return start, len(data)
+            end = nl + 1
+        return start, end - 1
+
+    def extract_chapter(self, chapter):
+        """Text of the chapter(s), or None if no heading matches."""
+        span = self.chapter_range(chapter)
+        return self.text(*span) if span else None
+
+    def close(self):
+        if self.size:
+            self.data.close()
+
+
+class Corpus:
+    """The book plus any supplementary sources for one course."""
+
+    def __init__(self, book, supplements=(), name=None):
+        self.book        = book
+        self.supplements = list(supplements)
+        self.name        = name or book.label
+
+    @property
+    def sources(self):
+        return [self.book] + self.supplements
+
+    @property
+    def size(self):
+        return sum(s.size for s in self.sources)
+
+    def extract_chapter(self, chapter):
+        """Chapter text from the book, or the whole book if it can't be found."""
+        return self.book.extract_chapter(chapter) or self.book.text()
+
+    def supplementary(self, chapter):
+        """(label, text) pairs of supplementary sources that cover the chapter."""
+        found = []
+        for source in self.supplements:
+            text = source.extract_chapter(chapter)
+            if text:
+                found.append((source.label, text))
+        return found
+
+
+def _text_files(directory):
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.endswith(TEXT_SUFFIXES))
+
+
+def _open_config(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    book = Source(os.path.join(base, config['book']), config.get('bookLabel'))
+    supplements = []
+    for entry in config.get('sources', []):
+        entry = {'path': entry} if isinstance(entry, str) else entry
+        target = os.path.join(base, entry['path'])
+        files  = _text_files(target) if os.path.isdir(target) else [target]
+        label  = entry.get('label')
+        supplements.extend(Source(p, f"{label} — {os.path.basename(p)}" if label and len(files) > 1 else label)
+                           for p in files)
+    return Corpus(book, supplements, config.get('name'))
+
+
+def _open(path):
+    if os.path.isdir(path):
+        config = os.path.join(path, 'corpus.json')
+        if os.path.exists(config):
+            return _open_config(config)
+        files = _text_files(path)
+        if not files:
+            raise FileNotFoundError(f"No {'/'.join(TEXT_SUFFIXES)} files in {path}")
+        book = next((p for p in files if os.path.basename(p) == 'book.txt'), files[0])
+        return Corpus(Source(book), [Source(p) for p in files if p != book])
+    if path.endswith('.json'):
+        return _open_config(path)
+    return Corpus(Source(path))
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load_corpus(path):
+    """Open (or reuse) the corpus at `path` — a file, directory or config."""
+    key = os.path.abspath(path)
+    with _cache_lock:
+        if key not in _cache:
+            _cache[key] = _open(path)
+        return _cache[key]
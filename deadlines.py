@@ -0,0 +1,161 @@
+"""
+Pipeline Deadlines & Run Results
+────────────────────────────────
+Per-stage and whole-run time budgets for run_pipeline, the exceptions
+that stop a run early, and the per-chapter record of which stages
+finished, failed, timed out or were cancelled.
+
+A stage timeout is enforced as the HTTP timeout of the in-flight API
+request, so a stalled call is abandoned instead of hanging the worker.
+"""
+
+import json
+import threading
+import time
+
+STAGES = ["Scholar", "Visionary", "AI Analyst", "CEO"]
+
+
+class StageError(Exception):
+    """Base class for anything that stops a pipeline run at a stage."""
+    status = "failed"
+
+    def __init__(self, stage, message=""):
+        super().__init__(f"{stage}: {message}" if message else stage)
+        self.stage = stage
+
+
+class StageFailed(StageError):
+    status = "failed"
+
+
+class StageTimeout(StageError):
+    status = "timed_out"
+
+
+class StageCancelled(StageError):
+    status = "cancelled"
+
+
+def _key(stage):
+    return stage.lower().replace(' ', '').replace('_', '')
+
+
+def parse_stage_timeouts(values):
+    """Parse CLI values like ["180", "CEO=300", "ai_analyst=120"].
+
+    A bare number applies to every stage that has no explicit limit.
+    Raises ValueError for unknown stages and bad or non-positive numbers.
+    """
+    known = {_key(s) for s in STAGES}
+    timeouts = {}
+    for value in values or []:
+        stage, _, seconds = value.rpartition('=')
+        if stage and _key(stage) not in known:
+            raise ValueError(f"unknown stage {stage!r} (expected one of {', '.join(STAGES)})")
+        try:
+            limit = float(seconds)
+        except ValueError:
+            raise ValueError(f"{value!r}: {seconds!r} is not a number of seconds") from None
+        if not limit > 0:
+            raise ValueError(f"{value!r}: timeout must be positive")
+        timeouts[stage or '*'] = limit
+    return timeouts
+
+
+class Deadline:
+    """Time budget for one chapter's run.
+
+    `stage_timeouts` maps stage names (or '*' for all stages) to seconds;
+    `run_timeout` bounds the whole run. `cancel` is a threading.Event
+    shared by every run in a batch so Ctrl-C stops them all.
+    """
+
+    def __init__(self, stage_timeouts=None, run_timeout=None, cancel=None):
+        self.stage_timeouts = {_key(k) if k != '*' else '*': v
+                               for k, v in (stage_timeouts or {}).items()}
+        self.run_timeout = run_timeout
+        self.cancel = cancel or threading.Event()
+        self.started = time.monotonic()
+
+    def remaining(self):
+        if self.run_timeout is None:
+            return None
+        return self.run_timeout - (time.monotonic() - self.started)
+
+    def timeout_for(self, stage, started=None):
+        """Seconds the next request for `stage` may take, or None for no limit.
+
+        `started` is when the stage began (time.monotonic()); time already
+        spent on earlier attempts, back-off and queueing then counts against
+        the stage limit. Raises StageCancelled if the batch was cancelled
+        and StageTimeout if the stage or run budget is already spent.
+        """
+        if self.cancel.is_set():
+            raise StageCancelled(stage, "run cancelled")
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise StageTimeout(stage, f"run deadline of {self.run_timeout:.0f}s exceeded")
+
+        stage_limit = self.stage_timeouts.get(_key(stage), self.stage_timeouts.get('*'))
+        if stage_limit is not None and started is not None:
+            left = stage_limit - (time.monotonic() - started)
+            if left <= 0:
+                raise StageTimeout(stage, f"stage deadline of {stage_limit:g}s exceeded")
+            stage_limit = left
+        limits = [t for t in (stage_limit, remaining) if t is not None]
+        return min(limits) if limits else None
+
+
+class RunResult:
+    """Status and completed outputs of each stage in one chapter's run."""
+
+    def __init__(self, chapter, output_file):
+        self.chapter     = chapter
+        self.output_file = output_file
+        self.stages      = {stage: "pending" for stage in STAGES}
+        self.outputs     = {}
+        self.assignment  = None
+        self.error       = None
+        self._lock       = threading.Lock()
+
+    @property
+    def ok(self):
+        return self.assignment is not None
+
+    def complete(self, stage, output):
+        with self._lock:
+            self.stages[stage]  = "ok"
+            self.outputs[stage] = output
+
+    def stop(self, stage, status, error=None):
+        """Mark `stage` with `status` and every later pending stage as cancelled."""
+        with self._lock:
+            self.stages[stage] = status
+            self.error = str(error) if error else status
+            for name, current in self.stages.items():
+                if current == "pending":
+                    self.stages[name] = "cancelled"
+
+    def pending_stage(self):
+        return next((s for s, status in self.stages.items() if status == "pending"), STAGES[-1])
+
+    @property
+    def partial_file(self):
+        stem = self.output_file[:-5] if self.output_file.endswith('.json') else self.output_file
+        return f"{stem}.partial.json"
+
+    def flush(self):
+        """Write completed stage outputs so an interrupted run isn't lost."""
+        with self._lock:
+            if not self.outputs:
+                return None
+            with open(self.partial_file, 'w', encoding='utf-8') as f:
+                json.dump({'chapter': self.chapter, 'stages': self.stages,
+                           'error': self.error, 'outputs': self.outputs},
+                          f, indent=2, ensure_ascii=False)
+            return self.partial_file
+
+    def summary(self):
+        marks = {"ok": "✅", "failed": "❌", "timed_out": "⏱️ ", "cancelled": "⏭️ ", "pending": "…"}
+        return "  ".join(f"{marks.get(status, '?')} {stage}" for stage, status in self.stages.items())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Adaptive Concurrency Limiter
+────────────────────────────
+AIMD (additive-increase / multiplicative-decrease) limit on concurrent
+API calls, kept separately for each model. While calls come back
+healthy the limit grows by one per full window of calls; an overload
+error (429/529, timeout) or a latency spike cuts it in half. Every
+change is logged so batch runs show how they found their throughput.
+
+Latency is tracked per output token when the caller reports token
+counts, so long responses aren't mistaken for spikes.
+
+Usage (demo against a scripted fake server):
+  python3 limiter.py --capacity 6 --calls 300
+  python3 limiter.py --capacity 3 --calls 300 --profile spiky
+
+Options:
+  --capacity   Concurrent calls the fake server handles before degrading
+  --calls      Number of calls to make
+  --profile    steady | spiky (capacity halves for the middle third)
+  --threads    Caller threads (default: 24)
+"""
+
+import argparse
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+OVERLOAD_STATUS = (429, 529)
+WAIT_SLICE      = 0.25      # seconds between cancel checks while queued
+
+
+def default_overloaded(exc):
+    """True for errors that mean "slow down" rather than "this call is broken"."""
+    return getattr(exc, 'status_code', None) in OVERLOAD_STATUS or isinstance(exc, TimeoutError)
+
+
+class SlotTimeout(TimeoutError):
+    """No slot freed up within the caller's timeout."""
+
+
+class SlotCancelled(Exception):
+    """The caller's cancel event was set while waiting for a slot."""
+
+
+class _ModelState:
+    def __init__(self, limit):
+        self.limit         = float(limit)
+        self.in_flight     = 0
+        self.baseline      = None     # slow-rising EWMA of healthy latency
+        self.last_decrease = 0.0
+
+
+class Slot:
+    """Handle yielded by AdaptiveLimiter.slot; set `tokens` after the call."""
+
+    def __init__(self):
+        self.tokens = None
+
+
+class AdaptiveLimiter:
+    """Per-model AIMD concurrency limiter."""
+
+    def __init__(self, initial=2, minimum=1, maximum=8, backoff=0.5, spike=2.0,
+                 smoothing=0.2, overloaded=default_overloaded, log=print):
+        self.initial    = initial
+        self.minimum    = minimum
+        self.maximum    = maximum
+        self.backoff    = backoff
+        self.spike      = spike
+        self.smoothing  = smoothing
+        self.overloaded = overloaded
+        self.log        = log
+        self._models    = {}
+        self._cond      = threading.Condition()
+
+    def _initial(self):
+        # `maximum` may be lowered after construction (e.g. --max-concurrency 1)
+        return max(self.minimum, min(self.initial, self.maximum))
+
+    def limit(self, model):
+        with self._cond:
+            state = self._models.get(model)
+            return int(state.limit) if state else self._initial()
+
+    @contextmanager
+    def slot(self, model, timeout=None, cancel=None):
+        """Block until `model` has capacity, then run one call in the slot.
+
+        Raises SlotTimeout after `timeout` seconds and SlotCancelled once
+        the `cancel` event (a threading.Event) is set.
+        """
+        give_up = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            state = self._models.setdefault(model, _ModelState(self._initial()))
+            while state.in_flight >= int(state.limit):
+                if cancel is not None and cancel.is_set():
+                    raise SlotCancelled(model)
+                left = None if give_up is None else give_up - time.monotonic()
+                if left is not None and left <= 0:
+                    raise SlotTimeout(model)
+                # Wake periodically so a cancel set elsewhere is noticed
+                self._cond.wait(WAIT_SLICE if left is None else min(left, WAIT_SLICE))
+            state.in_flight += 1
+
+        slot  = Slot()
+        start = time.monotonic()
+        try:
+            yield slot
+        except BaseException as e:
+            self._finish(model, state, start, slot, e)
+            raise
+        self._finish(model, state, start, slot, None)
+
+    def _finish(self, model, state, start, slot, error):
+        elapsed = time.monotonic() - start
+        latency = elapsed / slot.tokens if slot.tokens else elapsed
+        with self._cond:
+            saturated = state.in_flight >= int(state.limit)
+            state.in_flight -= 1
+
+            if error is not None:
+                if self.overloaded(error):
+                    self._decrease(model, state, start, type(error).__name__)
+            elif state.baseline is not None and latency > state.baseline * self.spike:
+                self._decrease(model, state, start,
+                               f"latency spike {latency / state.baseline:.1f}× baseline")
+            else:
+                # Follow drops quickly and rises slowly, so the baseline tracks
+                # unloaded latency instead of drifting up with the load
+                if state.baseline is None:
+                    state.baseline = latency
+                else:
+                    rate = self.smoothing if latency < state.baseline else self.smoothing / 10
+                    state.baseline += rate * (latency - state.baseline)
+                # Only grow when the current limit is actually being used
+                if saturated and state.limit < self.maximum:
+                    old = int(state.limit)
+                    state.limit = min(self.maximum, state.limit + 1 / int(state.limit))
+                    if int(state.limit) != old:
+                        self.log(f"  🎚️  {model}: concurrency {old} → {int(state.limit)} (healthy)")
+            self._cond.notify_all()
+
+    def _decrease(self, model, state, start, reason):
+        # Calls that started before the last cut saw the old limit; don't punish twice
+        if start < state.last_decrease:
+            return
+        old = int(state.limit)
+        state.limit = max(float(self.minimum), state.limit * self.backoff)
+        state.last_decrease = time.monotonic()
+        self.log(f"  🎚️  {model}: concurrency {old} → {int(state.limit)} ({reason})")
+
+
+# ── Scripted fake server for trying the limiter ─
+class FakeOverloaded(Exception):
+    status_code = 529
+
+
+class FakeServer:
+    """Serves calls with latency that degrades past `capacity` and 529s well past it."""
+
+    def __init__(self, capacity, profile='steady', calls=300, seed=0):
+        self.capacity = capacity
+        self.profile  = profile
+        self.calls    = calls
+        self.served   = 0
+        self.active   = 0
+        self.lock     = threading.Lock()
+        self.rng      = random.Random(seed)
+
+    def _capacity(self):
+        if self.profile == 'spiky' and self.calls / 3 <= self.served < 2 * self.calls / 3:
+            return max(1, self.capacity // 2)
+        return self.capacity
+
+    def call(self):
+        with self.lock:
+            self.active += 1
+            active, capacity = self.active, self._capacity()
+        try:
+            if active > 2 * capacity:
+                time.sleep(0.005)
+                raise FakeOverloaded()
+            overload = max(1.0, active / capacity)
+            time.sleep(0.02 * overload ** 2 * self.rng.uniform(0.8, 1.2))
+        finally:
+            with self.lock:
+                self.active -= 1
+                self.served += 1
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Try the adaptive limiter against a fake server')
+    parser.add_argument('--capacity', type=int, default=6)
+    parser.add_argument('--calls',    type=int, default=300)
+    parser.add_argument('--profile',  choices=['steady', 'spiky'], default='steady')
+    parser.add_argument('--threads',  type=int, default=24)
+    parser.add_argument('--max',      type=int, default=16, help='Limiter maximum')
+
+    args = parser.parse_args()
+
+    server  = FakeServer(args.capacity, args.profile, args.calls)
+    limiter = AdaptiveLimiter(maximum=args.max)
+    todo    = iter(range(args.calls))
+    todo_lock = threading.Lock()
+    errors  = []
+
+    def worker():
+        while True:
+            with todo_lock:
+                if next(todo, None) is None:
+                    return
+            try:
+                with limiter.slot('fake-model'):
+                    server.call()
+            except FakeOverloaded as e:
+                errors.append(e)
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - start
+
+    print(f"\n📈 {args.calls} calls in {elapsed:.2f}s ({args.calls / elapsed:.0f}/s), "
+          f"{len(errors)} overload errors, final limit {limiter.limit('fake-model')}")
@@ -9,12 +9,24 @@ Usage:
   python3 pipeline.py --chapter 11
   python3 pipeline.py --chapter "11-12"
   python3 pipeline.py --chapter 22 --push
+  python3 pipeline.py --chapter 6 7 8 --stage-timeout 180 --run-timeout 900
 
 Options:
-  --chapter   Chapter number or range (e.g. 11 or "11-12")
+  --chapter   Chapter number(s) or range (e.g. 11, "11-12", or 6 7 8 for a batch)
   --push      Automatically push to saleseqcoach.com after generation
-  --book      Path to book.txt (default: ./book.txt)
+  --book      Path to book.txt, a corpus directory, or a course corpus
+              config (.json) — see corpus.py (default: ./book.txt)
   --output    Output filename (default: assignment_chXX.json)
+  --index     Near-duplicate question index (default: question_index.db)
+  --artifacts Artifact store for stage inputs/outputs (default: ./artifacts)
+  --workers   Chapters in flight at once in a batch (default: all); the
+              adaptive limiter decides how many API calls actually run
+  --max-concurrency  Upper bound for the adaptive limiter, per model (default: 8)
+  --stage-timeout  Seconds per stage, or STAGE=SECONDS (repeatable)
+  --run-timeout    Seconds for a whole chapter run
+  --record    Record every agent exchange to a cassette file
+  --replay    Serve agent responses from a cassette file (offline; doesn't
+              update the question index or artifact store, can't --push)
 """
 
 import argparse
@@ -22,7 +34,11 @@ import json
 import os
 import sys
 import subprocess
-from anthropic import Anthropic
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from anthropic import Anthropic, APIConnectionError, APIStatusError, APITimeoutError
 
 # ── Import agent prompts ──────────────────────
 from agents.scholar     import SCHOLAR_PROMPT
@@ -30,59 +46,143 @@ from agents.visionary   import VISIONARY_PROMPT
 from agents.ai_analyst  import AI_ANALYST_PROMPT
 from agents.ceo         import CEO_PROMPT
 
-client = Anthropic()
-MODEL  = "claude-sonnet-4-6"
+from question_index import QuestionIndex, INDEX_PATH, chapter_key
+from artifacts      import ArtifactStore, ARTIFACTS_ROOT, prompt_hash
+from simulate_chat  import FakeClient, run_simulation, MAX_SYSTEM_TOKENS
+from corpus         import load_corpus
+from limiter        import (AdaptiveLimiter, OVERLOAD_STATUS, SlotCancelled, SlotTimeout,
+                            default_overloaded)
+from cassette       import Cassette, CassetteExhausted
+from deadlines      import (Deadline, RunResult, StageCancelled, StageError, StageFailed, StageTimeout,
+                            parse_stage_timeouts)
+
+MODEL    = "claude-sonnet-4-6"
+client   = None     # created on first live call, so --replay needs no API key
+cassette = None     # cassette.Cassette when running with --record / --replay
+
+API_RETRIES    = 3
+MAX_RETRY_WAIT = 60     # seconds; the most a retry-after header can make us wait
+
+def _retryable(exc):
+    """Transient errors worth another attempt (what the SDK itself retries)."""
+    if isinstance(exc, APIStatusError):
+        return exc.status_code in (408, 409) + OVERLOAD_STATUS or exc.status_code >= 500
+    return isinstance(exc, APIConnectionError) and not isinstance(exc, APITimeoutError)
+
+def _retry_after(exc):
+    """Seconds the API asked us to wait before retrying, or None."""
+    headers = getattr(getattr(exc, 'response', None), 'headers', None) or {}
+    for name, scale in (('retry-after-ms', 1000), ('retry-after', 1)):
+        try:
+            return float(headers[name]) / scale
+        except (KeyError, TypeError, ValueError):
+            continue    # missing, or an HTTP date — fall back to our own back-off
+    return None
+
+def _overloaded(exc):
+    return isinstance(exc, APITimeoutError) or default_overloaded(exc)
+
+# Shared by every chapter in a batch; tunes concurrency per model
+limiter = AdaptiveLimiter(overloaded=_overloaded)
+
+def get_client():
+    global client
+    if client is None:
+        client = Anthropic()
+    return client
 
 def load_book(book_path):
-    """Load the full book text."""
+    """Open the book (or course corpus) as memory-mapped sources."""
     if not os.path.exists(book_path):
         print(f"❌ Book not found at: {book_path}")
         print("   Make sure book.txt is in this folder or use --book to specify path")
         sys.exit(1)
-    with open(book_path, 'r', encoding='utf-8') as f:
-        return f.read()
-
-def extract_chapter(book_text, chapter):
-    """Try to extract just the relevant chapter(s) from the book."""
-    # Try to find chapter markers
-    chapter_str = str(chapter).replace('-', '–')
-    lines = book_text.split('\n')
-    
-    # Look for chapter start
-    start_idx = None
-    end_idx   = None
-    
-    for i, line in enumerate(lines):
-        line_lower = line.lower().strip()
-        if f'chapter {chapter}' in line_lower or f'chapter {chapter_str}' in line_lower:
-            if start_idx is None:
-                start_idx = i
-        elif start_idx is not None and line_lower.startswith('chapter '):
-            end_idx = i
-            break
-    
-    if start_idx is not None:
-        chapter_lines = lines[start_idx:end_idx] if end_idx else lines[start_idx:start_idx+500]
-        return '\n'.join(chapter_lines)
-    
-    # If we can't find it, return full book (Scholar will find what it needs)
-    return book_text
-
-def call_agent(agent_name, system_prompt, user_message, expect_json=True):
-    """Call an agent and return its response."""
+    return load_corpus(book_path)
+
+def debug_file(agent_name, chapter=None):
+    """Where an agent's unparseable response is saved (one per chapter in batch runs)."""
+    name = agent_name.lower().replace(" ", "_")
+    return f"debug_{name}.txt" if chapter is None else f"debug_{name}_{chapter_key(chapter)}.txt"
+
+def call_agent(agent_name, system_prompt, user_message, expect_json=True, artifacts=None,
+               deadline=None, chapter=None):
+    """Call an agent and return its response.
+
+    If `artifacts` (an artifacts.Run) is given, the system prompt, input
+    and raw output are saved to the artifact store. If `deadline` is
+    given, the request is abandoned once the stage's time budget runs
+    out and StageTimeout is raised. With a module-level `cassette`, the
+    exchange is recorded (tagged with `chapter`), or served from disk
+    when replaying.
+    """
     import re
+    started = time.monotonic()
+    timeout = deadline.timeout_for(agent_name, started) if deadline else None
+    
     print(f"\n{chr(8212)*50}")
-    print(f"  {agent_name} is working...")
+    print(f"  {agent_name} is working..." + (f" (timeout {timeout:.0f}s)" if timeout else ""))
     print(f"{chr(8212)*50}")
     
-    response = client.messages.create(
+    request = dict(
         model=MODEL,
         max_tokens=8000,
         system=system_prompt,
         messages=[{"role": "user", "content": user_message}]
     )
     
-    text = response.content[0].text
+    if cassette and cassette.replaying:
+        try:
+            raw = cassette.replay(agent_name, request, chapter)
+        except CassetteExhausted as e:
+            raise StageFailed(agent_name, str(e)) from e
+    else:
+        # Retries happen here rather than in the SDK so the limiter sees every
+        # 429/529, and every attempt, back-off and queue wait comes out of
+        # the same stage budget. Like the SDK, honour the API's retry-after.
+        cancel = deadline.cancel if deadline else None
+        for attempt in range(API_RETRIES + 1):
+            try:
+                with limiter.slot(MODEL, timeout, cancel) as slot:
+                    timeout = deadline.timeout_for(agent_name, started) if deadline else None
+                    api = get_client().with_options(max_retries=0, **({'timeout': timeout} if timeout else {}))
+                    response = api.messages.create(**request)
+                    slot.tokens = response.usage.output_tokens
+                break
+            except (APITimeoutError, SlotTimeout) as e:
+                waited = f" after {time.monotonic() - started:.0f}s" if timeout else ""
+                print(f"  ⏱️  {agent_name} timed out{waited}")
+                raise StageTimeout(agent_name, f"no response{waited}") from e
+            except SlotCancelled as e:
+                raise StageCancelled(agent_name, "run cancelled") from e
+            except (APIStatusError, APIConnectionError) as e:
+                if not _retryable(e):
+                    raise
+                reason = f"API error {e.status_code}" if isinstance(e, APIStatusError) else "connection error"
+                if attempt == API_RETRIES:
+                    raise StageFailed(agent_name, f"{reason} after {API_RETRIES + 1} attempts") from e
+                retry_after = _retry_after(e)
+                wait = min(retry_after, MAX_RETRY_WAIT) if retry_after is not None else 2 ** attempt
+                if deadline:
+                    timeout = deadline.timeout_for(agent_name, started)
+                    wait = min(wait, timeout) if timeout else wait
+                print(f"  ⚠️  {agent_name}: {reason}, retrying in {wait:.1f}s")
+                if cancel is not None:
+                    cancel.wait(wait)
+                else:
+                    time.sleep(wait)
+                if deadline:
+                    timeout = deadline.timeout_for(agent_name, started)
+        raw = response.content[0].text
+        if cassette:
+            cassette.record(agent_name, request, raw, chapter)
+    
+    text = raw
+    
+    if artifacts:
+        phash = prompt_hash(system_prompt)
+        artifacts.put(agent_name, 'system', system_prompt, phash)
+        artifacts.put(agent_name, 'input',  user_message,  phash)
+        artifacts.put(agent_name, 'output', text,          phash)
     
     if expect_json:
         extracted = None
@@ -123,16 +223,51 @@ def call_agent(agent_name, system_prompt, user_message, expect_json=True):
         except json.JSONDecodeError as e:
             print(f"  ⚠️  {agent_name} returned invalid JSON: {e}")
             print(f"  Raw response saved for debugging")
-            fname = "debug_" + agent_name.lower().replace(" ", "_") + ".txt"
-            with open(fname, "w") as f:
-                f.write(response.content[0].text)
+            with open(debug_file(agent_name, chapter), "w") as f:
+                f.write(raw)
             return None
     
     print(f"  ✅ {agent_name} complete")
     return text
 
-def run_pipeline(chapter, book_path, output_file, auto_push):
-    """Run the full agent pipeline."""
+def run_pipeline(chapter, book_path, output_file, auto_push, index_path=INDEX_PATH,
+                 artifacts_root=ARTIFACTS_ROOT, stage_timeouts=None, run_timeout=None,
+                 cancel=None, result=None):
+    """Run the full agent pipeline for one chapter and return its RunResult.
+
+    A stage that fails, times out or is cancelled stops the run: later
+    stages are marked cancelled and the outputs of completed stages are
+    flushed to <output>.partial.json.
+    """
+    result   = result or RunResult(chapter, output_file)
+    deadline = Deadline(stage_timeouts, run_timeout, cancel)
+    try:
+        replaying = cassette is not None and cassette.replaying
+        index_file = index_path if not replaying or os.path.exists(index_path) else ':memory:'
+        with (nullcontext() if replaying else ArtifactStore(artifacts_root)) as store, \
+                QuestionIndex(index_file) as question_index:
+            result.assignment = _run_stages(chapter, book_path, output_file, auto_push,
+                                            store, question_index, deadline, result)
+    except Exception as e:
+        if not isinstance(e, StageError):
+            # API errors, bad corpus configs, … still mark the run and flush it
+            e = StageFailed(result.pending_stage(), f"{type(e).__name__}: {e}")
+        result.stop(e.stage, e.status, e)
+        print(f"\n❌ Chapter {chapter}: {e.stage} {e.status.replace('_', ' ')} ({e}) — later stages cancelled")
+        saved = result.flush()
+        if saved:
+            print(f"   Completed stage outputs saved to {saved}")
+    except KeyboardInterrupt:
+        result.stop(result.pending_stage(), "cancelled", "interrupted")
+        saved = result.flush()
+        if saved:
+            print(f"\n   Completed stage outputs saved to {saved}")
+        raise
+    return result
+
+def _run_stages(chapter, book_path, output_file, auto_push, store, question_index,
+                deadline, result):
+    """The Scholar → Visionary → AI Analyst → CEO chain itself."""
     
     print(f"\n🚀 Sales EQ Assignment Pipeline")
     print(f"   Chapter: {chapter}")
@@ -141,9 +276,15 @@ def run_pipeline(chapter, book_path, output_file, auto_push):
     
     # ── Load book ────────────────────────────────
     print(f"\n📚 Loading book...")
-    book_text = load_book(book_path)
-    chapter_text = extract_chapter(book_text, chapter)
-    print(f"   Book loaded ({len(book_text):,} chars)")
+    corpus = load_book(book_path)
+    chapter_text = corpus.extract_chapter(chapter)
+    supplements  = corpus.supplementary(chapter)
+    print(f"   Book loaded ({corpus.book.size:,} bytes"
+          + (f", +{len(corpus.supplements)} supplementary" if corpus.supplements else "") + ")")
+    
+    run = store.run(chapter) if store else None
+    if run:
+        print(f"   Artifacts: {store.root} (run {run.run_id})")
     
     # ── AGENT 1: Scholar ─────────────────────────
     scholar_input = f"""
@@ -158,16 +299,22 @@ the full book context provided at the start of this conversation.
 
 Produce your structured JSON analysis.
 """
+    for label, text in supplements:
+        scholar_input += f"\nSUPPLEMENTARY COURSE MATERIAL — {label}:\n\n{text}\n"
     
     scholar_output = call_agent(
         "Scholar",
-        SCHOLAR_PROMPT + f"\n\nFull book for reference:\n{book_text[:8000]}",
-        scholar_input
+        SCHOLAR_PROMPT + f"\n\nFull book for reference:\n{corpus.book.head(8000)}",
+        scholar_input,
+        artifacts=run,
+        deadline=deadline,
+        chapter=chapter
     )
     
     if not scholar_output:
-        print("❌ Scholar failed. Check debug_scholar.txt")
-        sys.exit(1)
+        print(f"❌ Scholar failed. Check {debug_file('Scholar', chapter)}")
+        raise StageFailed("Scholar", "invalid JSON")
+    result.complete("Scholar", scholar_output)
     
     print(f"\n  Scholar found: {len(scholar_output.get('keyFrameworks', []))} frameworks, "
           f"{len(scholar_output.get('coreSkills', []))} core skills, "
@@ -187,12 +334,16 @@ Create a scenario that REQUIRES the chapter's core skills to succeed.
     visionary_output = call_agent(
         "Visionary",
         VISIONARY_PROMPT,
-        visionary_input
+        visionary_input,
+        artifacts=run,
+        deadline=deadline,
+        chapter=chapter
     )
     
     if not visionary_output:
-        print("❌ Visionary failed. Check debug_visionary.txt")
-        sys.exit(1)
+        print(f"❌ Visionary failed. Check {debug_file('Visionary', chapter)}")
+        raise StageFailed("Visionary", "invalid JSON")
+    result.complete("Visionary", visionary_output)
     
     print(f"\n  Visionary created: '{visionary_output.get('scenarioTitle', 'scenario')}'")
     
@@ -212,12 +363,16 @@ Run your cheat test and development test. Approve or revise.
     analyst_output = call_agent(
         "AI Analyst",
         AI_ANALYST_PROMPT,
-        analyst_input
+        analyst_input,
+        artifacts=run,
+        deadline=deadline,
+        chapter=chapter
     )
     
     if not analyst_output:
-        print("❌ AI Analyst failed. Check debug_ai_analyst.txt")
-        sys.exit(1)
+        print(f"❌ AI Analyst failed. Check {debug_file('AI Analyst', chapter)}")
+        raise StageFailed("AI Analyst", "invalid JSON")
+    result.complete("AI Analyst", analyst_output)
     
     verdict = analyst_output.get('verdict', 'UNKNOWN')
     print(f"\n  AI Analyst verdict: {verdict}")
@@ -250,17 +405,57 @@ Output ONLY the final JSON.
     final_assignment = call_agent(
         "CEO",
         CEO_PROMPT,
-        ceo_input
+        ceo_input,
+        artifacts=run,
+        deadline=deadline,
+        chapter=chapter
     )
     
     if not final_assignment:
-        print("❌ CEO failed. Check debug_ceo.txt")
-        sys.exit(1)
+        print(f"❌ CEO failed. Check {debug_file('CEO', chapter)}")
+        raise StageFailed("CEO", "invalid JSON")
+    result.complete("CEO", final_assignment)
+    
+    # ── Near-duplicate check ─────────────────────
+    # Keyed by chapter: the CEO invents a new slug every run, so keying by
+    # slug would leave each old draft in the index to be flagged next time
+    index_key  = chapter_key(chapter)
+    duplicates = question_index.find_duplicates(final_assignment, key=index_key)
+    
+    if duplicates:
+        print(f"\n  Question index: {len(duplicates)} near-duplicate questions — asking CEO to rewrite them")
+        avoid = "\n".join(f"- {m['text']}" for _, matches in duplicates for m in matches)
+        try:
+            revised = call_agent(
+                "CEO",
+                CEO_PROMPT,
+                ceo_input + f"""
+EXISTING QUESTIONS TO AVOID (already used in other assignments — do not repeat or paraphrase):
+{avoid}
+
+Questions {', '.join(qid for qid, _ in duplicates)} were too close to the ones above.
+Replace them with genuinely new questions.
+""",
+                artifacts=run,
+                deadline=deadline,
+                chapter=chapter
+            )
+        except StageError as e:
+            print(f"  Rewrite {e.status.replace('_', ' ')} — keeping the original quiz")
+            revised = None
+        if revised:
+            final_assignment = revised
+            duplicates = question_index.find_duplicates(final_assignment, key=index_key)
     
     # ── Save output ──────────────────────────────
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(final_assignment, f, indent=2, ensure_ascii=False)
     
+    # A replay is an offline dry run — leave the shared index and store alone
+    if run:
+        question_index.add_assignment(final_assignment, key=index_key)
+        run.put('Assignment', 'output', json.dumps(final_assignment, indent=2, ensure_ascii=False))
+    
     print(f"\n{'═'*50}")
     print(f"  ✅ Assignment complete!")
     print(f"  Title: {final_assignment.get('title', 'N/A')}")
@@ -269,23 +464,42 @@ Output ONLY the final JSON.
     print(f"  Saved: {output_file}")
     print(f"{'═'*50}\n")
     
+    for qid, matches in duplicates:
+        best = matches[0]
+        print(f"⚠️  {qid} is a near-duplicate ({best['similarity']:.0%}) of {best['slug']}/{best['id']}")
+    if duplicates:
+        print()
+    
+    # ── Part 2 load check ────────────────────────
+    load = run_simulation(final_assignment, FakeClient(seed=0), conversations=20, seed=0)
+    print(f"💬 Part 2 load: ~{load['tokensPerConversation']['mean']:,.0f} tokens, "
+          f"${load['costPerConversation']:.4f} per student")
+    oversized = load['systemTokens'] > MAX_SYSTEM_TOKENS
+    if oversized:
+        print(f"⚠️  Part 2 system prompt is ~{load['systemTokens']:,} tokens "
+              f"(limit {MAX_SYSTEM_TOKENS:,}) — run simulate_chat.py {output_file} before publishing")
+    print()
+    
     # ── Auto push ────────────────────────────────
-    if auto_push:
+    if auto_push and oversized:
+        print("⚠️  Skipping push — trim the Part 2 system prompt first")
+        print(f"   Then push manually: node push-assignment.js {output_file}\n")
+    elif auto_push:
         admin_key = os.environ.get('SALESEQ_ADMIN_KEY', '')
         if not admin_key:
             print("⚠️  SALESEQ_ADMIN_KEY not set — skipping push")
             print(f"   To push manually: node push-assignment.js {output_file}")
         else:
             print("📤 Pushing to saleseqcoach.com...")
-            result = subprocess.run(
+            push = subprocess.run(
                 ['node', 'push-assignment.js', output_file],
                 capture_output=True, text=True,
                 env={**os.environ, 'SALESEQ_ADMIN_KEY': admin_key}
             )
-            if result.returncode == 0:
-                print(result.stdout)
+            if push.returncode == 0:
+                print(push.stdout)
             else:
-                print(f"❌ Push failed: {result.stderr}")
+                print(f"❌ Push failed: {push.stderr}")
                 print(f"   Try manually: node push-assignment.js {output_file}")
     else:
         print(f"📤 To push to dashboard:")
@@ -296,21 +510,105 @@ Output ONLY the final JSON.
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Generate a Sales EQ assignment')
-    parser.add_argument('--chapter', required=True, help='Chapter number or range (e.g. 11 or 11-12)')
-    parser.add_argument('--book',    default='book.txt', help='Path to book.txt')
-    parser.add_argument('--output',  default=None, help='Output JSON filename')
+    parser.add_argument('--chapter', required=True, nargs='+', help='Chapter number(s) or range (e.g. 11, 11-12, or 6 7 8)')
+    parser.add_argument('--book', '--corpus', default='book.txt',
+                        help='Path to book.txt, a corpus directory, or a course corpus config (.json)')
+    parser.add_argument('--output',  default=None, help='Output JSON filename (single chapter only)')
     parser.add_argument('--push',    action='store_true', help='Auto-push to saleseqcoach.com')
+    parser.add_argument('--index',   default=INDEX_PATH, help='Near-duplicate question index file')
+    parser.add_argument('--artifacts', default=ARTIFACTS_ROOT, help='Artifact store directory')
+    parser.add_argument('--workers', type=int, default=None, help='Chapters in flight at once (default: all)')
+    parser.add_argument('--max-concurrency', type=int, default=limiter.maximum,
+                        help='Most concurrent API calls per model')
+    parser.add_argument('--stage-timeout', action='append', metavar='[STAGE=]SECONDS',
+                        help='Per-stage timeout, e.g. 180 or CEO=300 (repeatable)')
+    parser.add_argument('--run-timeout', type=float, default=None, help='Whole-run timeout per chapter (seconds)')
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument('--record', metavar='CASSETTE', help='Record agent exchanges to a cassette file')
+    recording.add_argument('--replay', metavar='CASSETTE', help='Replay agent responses from a cassette file')
     
     args = parser.parse_args()
     
-    # Auto-generate output filename
-    if not args.output:
-        ch = str(args.chapter).replace(' ', '_').replace('-', '_')
-        args.output = f"assignment_ch{ch}.json"
+    if args.replay and args.push:
+        parser.error('--push cannot be used with --replay')
+    if args.output and len(args.chapter) > 1:
+        parser.error('--output only works with a single --chapter')
+    
+    try:
+        stage_timeouts = parse_stage_timeouts(args.stage_timeout)
+    except ValueError as e:
+        parser.error(f'--stage-timeout: {e}')
     
-    run_pipeline(
-        chapter=args.chapter,
+    # Auto-generate output filename
+    def output_for(chapter):
+        if args.output:
+            return args.output
+        ch = str(chapter).replace(' ', '_').replace('-', '_')
+        return f"assignment_ch{ch}.json"
+    
+    if args.record:
+        cassette = Cassette(args.record, 'record')
+    elif args.replay:
+        if not os.path.exists(args.replay):
+            print(f"❌ Cassette not found: {args.replay}")
+            sys.exit(1)
+        cassette = Cassette(args.replay, 'replay')
+    
+    limiter.maximum = args.max_concurrency
+    cancel  = threading.Event()
+    results = {ch: RunResult(ch, output_for(ch)) for ch in args.chapter}
+    options = dict(
         book_path=args.book,
-        output_file=args.output,
-        auto_push=args.push
+        auto_push=args.push,
+        index_path=args.index,
+        artifacts_root=args.artifacts,
+        stage_timeouts=stage_timeouts,
+        run_timeout=args.run_timeout,
+        cancel=cancel
     )
+    
+    if len(args.chapter) == 1:
+        ch = args.chapter[0]
+        try:
+            run_pipeline(chapter=ch, output_file=output_for(ch), result=results[ch], **options)
+        except KeyboardInterrupt:
+            print("\n🛑 Interrupted")
+            sys.exit(130)
+        if cassette:
+            cassette.report()
+        sys.exit(0 if results[ch].ok else 1)
+    
+    # ── Batch: one worker per chapter ───────────
+    pool = ThreadPoolExecutor(max_workers=args.workers or len(args.chapter))
+    futures = {ch: pool.submit(run_pipeline, chapter=ch, output_file=output_for(ch),
+                               result=results[ch], **options)
+               for ch in args.chapter}
+    try:
+        for ch, future in futures.items():
+            try:
+                future.result()
+            except (Exception, SystemExit) as e:
+                results[ch].stop(results[ch].pending_stage(), "failed", e)
+                results[ch].flush()
+    except KeyboardInterrupt:
+        # In-flight requests can't be interrupted from here, so flush what
+        # finished and exit without waiting for worker threads.
+        cancel.set()
+        print("\n🛑 Interrupted — cancelling remaining stages")
+        for result in results.values():
+            if not result.ok:
+                result.stop(result.pending_stage(), "cancelled", "interrupted")
+                saved = result.flush()
+                if saved:
+                    print(f"   Chapter {result.chapter}: completed stage outputs saved to {saved}")
+        sys.stdout.flush()
+        os._exit(130)
+    pool.shutdown()
+    
+    print(f"\n{'═'*50}")
+    for ch, result in results.items():
+        print(f"  Ch {ch:<6} {result.summary()}")
+    print(f"{'═'*50}\n")
+    if cassette:
+        cassette.report()
+    sys.exit(0 if all(r.ok for r in results.values()) else 1)
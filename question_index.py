@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Quiz Question Index
+──────────────────────────────────
+MinHash/LSH index over every p1 quiz question (text + options)
+in generated assignments. Lives in a small SQLite file and is
+updated incrementally each time the pipeline saves an assignment.
+
+Usage:
+  python3 question_index.py add public/assignments/*.json assignment_ch*.json
+  python3 question_index.py check assignment_ch11.json
+  python3 question_index.py stats
+
+Options:
+  --index      Path to the index file (default: question_index.db)
+  --threshold  Minimum estimated similarity to report (default: 0.5)
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+from array import array
+
+NUM_PERM   = 128          # MinHash signature length
+BANDS      = 32           # LSH bands  (BANDS * ROWS == NUM_PERM)
+ROWS       = 4            # rows per band → candidate threshold ≈ (1/32)^(1/4) ≈ 0.42
+SHINGLE    = 3            # word n-gram size
+THRESHOLD  = 0.5
+INDEX_PATH = "question_index.db"
+
+_PRIME = (1 << 61) - 1
+_MASK  = (1 << 32) - 1
+_rng   = random.Random(370)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def question_text(question):
+    """Flatten a quiz question and its options into one string."""
+    parts = [question.get('text', '')]
+    parts.extend(question.get('options', []))
+    return ' '.join(p for p in parts if p)
+
+
+def assignment_key(assignment):
+    """Key an assignment's questions are stored under (slug, else title)."""
+    return assignment.get('slug') or assignment.get('title', 'unknown')
+
+
+def chapter_key(chapter):
+    """Stable key for a chapter's assignment ("ch6", "ch11_12"), matching the
+    slugs of published assignments. Model-written slugs change every run."""
+    return "ch" + str(chapter).replace(' ', '_').replace('-', '_').replace('–', '_')
+
+
+def shingles(text):
+    """Word n-gram shingles of normalized text, hashed to 64-bit ints."""
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = [' '.join(words[i:i+SHINGLE]) for i in range(len(words) - SHINGLE + 1)]
+    return {int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), 'little')
+            for g in grams}
+
+
+def minhash(text):
+    """MinHash signature (NUM_PERM 32-bit ints) for a piece of text.
+
+    Returns None for text with no words — it has nothing to compare, and
+    a shared placeholder signature would make all such texts "match".
+    """
+    hashed = shingles(text)
+    if not hashed:
+        return None
+    return array('I', [min(((a * x + b) % _PRIME) & _MASK for x in hashed)
+                       for a, b in _PERMS])
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def _band_keys(sig):
+    for band in range(BANDS):
+        chunk = sig[band*ROWS:(band+1)*ROWS].tobytes()
+        yield band, hashlib.blake2b(chunk, digest_size=8).digest()
+
+
+class QuestionIndex:
+    """Persistent MinHash/LSH index of quiz questions."""
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS questions (
+                id        INTEGER PRIMARY KEY,
+                slug      TEXT NOT NULL,
+                qid       TEXT NOT NULL,
+                text      TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                UNIQUE (slug, qid)
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band        INTEGER NOT NULL,
+                key         BLOB    NOT NULL,
+                question_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (band, key);
+            CREATE INDEX IF NOT EXISTS buckets_owner  ON buckets (question_id);
+        """)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+    # ── Updates ──────────────────────────────────
+    def add_assignment(self, assignment, key=None):
+        """Index (or re-index) every quiz question of one assignment.
+
+        Questions are keyed by (key, question id), so re-saving an
+        assignment replaces its old entries instead of duplicating them.
+        `key` defaults to assignment_key(assignment).
+        Questions without any words are skipped.
+        Returns the number of questions indexed.
+        """
+        slug = key or assignment_key(assignment)
+        questions = assignment.get('p1', {}).get('questions', [])
+        with self.db:
+            old = [r[0] for r in self.db.execute(
+                "SELECT id FROM questions WHERE slug = ?", (slug,))]
+            self.db.executemany("DELETE FROM buckets WHERE question_id = ?", [(i,) for i in old])
+            self.db.execute("DELETE FROM questions WHERE slug = ?", (slug,))
+            indexed = 0
+            for n, q in enumerate(questions):
+                text = question_text(q)
+                sig  = minhash(text)
+                if sig is None:
+                    continue
+                indexed += 1
+                cur  = self.db.execute(
+                    "INSERT INTO questions (slug, qid, text, signature) VALUES (?, ?, ?, ?)",
+                    (slug, q.get('id', f'q{n+1}'), text, sig.tobytes()))
+                self.db.executemany(
+                    "INSERT INTO buckets (band, key, question_id) VALUES (?, ?, ?)",
+                    [(band, key, cur.lastrowid) for band, key in _band_keys(sig)])
+        return indexed
+
+    # ── Queries ──────────────────────────────────
+    def query(self, text, threshold=THRESHOLD, exclude_slug=None, limit=10):
+        """Find indexed questions similar to `text`.
+
+        Only questions sharing at least one LSH band are compared, so
+        lookup cost depends on the number of near matches rather than
+        on the size of the index.
+        Returns a list of dicts sorted by descending similarity.
+        """
+        sig = minhash(text)
+        if sig is None:
+            return []
+        candidates = set()
+        for band, key in _band_keys(sig):
+            candidates.update(r[0] for r in self.db.execute(
+                "SELECT question_id FROM buckets WHERE band = ? AND key = ?", (band, key)))
+        if not candidates:
+            return []
+
+        matches = []
+        marks = ','.join('?' * len(candidates))
+        for slug, qid, qtext, blob in self.db.execute(
+                f"SELECT slug, qid, text, signature FROM questions WHERE id IN ({marks})",
+                tuple(candidates)):
+            if slug == exclude_slug:
+                continue
+            other = array('I')
+            other.frombytes(blob)
+            score = similarity(sig, other)
+            if score >= threshold:
+                matches.append({'slug': slug, 'id': qid, 'text': qtext, 'similarity': score})
+        matches.sort(key=lambda m: m['similarity'], reverse=True)
+        return matches[:limit]
+
+    def find_duplicates(self, assignment, threshold=THRESHOLD, key=None):
+        """Near-duplicates of an assignment's questions among *other* assignments.
+
+        Entries stored under `key` (default assignment_key(assignment))
+        are the assignment's own and are never reported.
+        Returns a list of (question id, matches) pairs for questions that
+        have at least one match.
+        """
+        slug = key or assignment_key(assignment)
+        flagged = []
+        for n, q in enumerate(assignment.get('p1', {}).get('questions', [])):
+            matches = self.query(question_text(q), threshold, exclude_slug=slug)
+            if matches:
+                flagged.append((q.get('id', f'q{n+1}'), matches))
+        return flagged
+
+
+def _load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _expand(patterns):
+    paths = []
+    for pattern in patterns:
+        paths.extend(sorted(glob.glob(pattern)) or [pattern])
+    return paths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Near-duplicate quiz question index')
+    parser.add_argument('command', choices=['add', 'check', 'stats'])
+    parser.add_argument('files', nargs='*', help='Assignment JSON files (globs allowed)')
+    parser.add_argument('--index',     default=INDEX_PATH, help='Path to the index file')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='Similarity threshold')
+
+    args = parser.parse_args()
+
+    with QuestionIndex(args.index) as index:
+        if args.command == 'stats':
+            print(f"📇 {len(index):,} questions indexed in {args.index}")
+            sys.exit(0)
+
+        for path in _expand(args.files):
+            if not os.path.exists(path):
+                print(f"❌ File not found: {path}")
+                continue
+            assignment = _load(path)
+
+            if args.command == 'add':
+                count = index.add_assignment(assignment)
+                print(f"  ✅ {path}: indexed {count} questions")
+                continue
+
+            flagged = index.find_duplicates(assignment, args.threshold)
+            if not flagged:
+                print(f"  ✅ {path}: no near-duplicate questions")
+            for qid, matches in flagged:
+                print(f"  ⚠️  {path} {qid} resembles:")
+                for m in matches:
+                    print(f"     {m['similarity']:.2f}  {m['slug']}/{m['id']}: {m['text'][:90]}")
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Part 2 Conversation Load Simulator
+──────────────────────────────────
+Plays synthetic students against a generated assignment's Part 2
+scenario, replaying the same request pattern the student page sends
+to /api/chat (full history every turn, then one evaluation call),
+and reports token usage and projected cost before publishing.
+
+Usage:
+  python3 simulate_chat.py assignment_ch11.json
+  python3 simulate_chat.py assignment_ch11.json --conversations 200 --workers 32
+  python3 simulate_chat.py assignment_ch11.json --live --conversations 3
+
+Options:
+  --conversations      Number of synthetic conversations (default: 50)
+  --workers            Conversations run concurrently (default: 16)
+  --class-sizes        Class sizes to project cost for (default: 25,50,100,200)
+  --max-system-tokens  Fail if the system prompt is larger (default: 2000)
+  --seed               Seed for the synthetic students and fake replies (default: 0)
+  --live               Use the real Anthropic API instead of the local fake
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Mirrors src/pages/Assignment.jsx
+DEFAULT_MODEL     = 'claude-haiku-4-5-20251001'
+DEFAULT_MAX_TURNS = 12
+CHAT_MAX_TOKENS   = 512
+EVAL_MAX_TOKENS   = 300
+MAX_SYSTEM_TOKENS = 2000
+EVAL_SYSTEM       = 'You are a grading assistant. Respond with only valid JSON, no markdown, no backticks, no extra text.'
+
+# Same template as evaluateConversation() in src/pages/Assignment.jsx
+EVAL_FALLBACK_CRITERIA = "Overall quality of the student's sales technique, communication, and application of concepts."
+EVAL_PROMPT = """You are an expert evaluator for a BYU-Idaho Professional Selling course using Sales EQ by Jeb Blount.
+
+Evaluate the student's performance in the following conversation based on these specific criteria:
+
+{criteria}
+
+Here is the full conversation:
+
+{transcript}
+
+Score the student from 0-100. Be fair but rigorous — a student who gives vague or generic advice should score 40-60. A student who demonstrates specific knowledge of Blount's framework and gives actionable, persona-specific guidance should score 75-95. Only give 95+ for truly exceptional responses.
+
+Respond with ONLY a JSON object, no other text:
+{{"score": <number 0-100>, "feedback": "<2-3 sentences explaining what they did well and what they could improve>"}}"""
+
+# USD per million tokens (input, output)
+PRICING = {
+    'claude-haiku-4-5-20251001': (1.00, 5.00),
+    'claude-sonnet-4-6':         (3.00, 15.00),
+    'claude-opus-4-6':           (5.00, 25.00),
+}
+
+STUDENT_LINES = [
+    "Walk me through the deals in your pipeline.",
+    "Which of these opportunities do you honestly think will close this quarter?",
+    "What makes you confident about that one?",
+    "How long has that deal been sitting at this stage?",
+    "What would happen if you let that one go and focused elsewhere?",
+    "I hear you. How does that make you feel about your number?",
+    "Let's talk about what you'd need to do differently next week.",
+    "Who is the actual decision maker on that account?",
+    "Can you tell me more about why they went quiet?",
+    "What's your plan for replacing the deals you'll lose?",
+    "That makes sense. What's the next concrete step?",
+    "Okay, let's prioritize — give me your top three.",
+]
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+# ── Model clients ────────────────────────────
+class FakeClient:
+    """Local stand-in for the Anthropic API.
+
+    Returns canned replies of realistic length and reports usage with
+    the same ~4 chars/token estimate, so runs are free and offline.
+    Pass each conversation's own `rng` to create() — a shared generator
+    drawn from by concurrent threads makes seeded runs unrepeatable.
+    """
+
+    def __init__(self, reply_words=(40, 140), latency=(0.0, 0.0), seed=None):
+        self.reply_words = reply_words
+        self.latency = latency
+        self.rng = random.Random(seed)
+
+    def create(self, model, max_tokens, system, messages, rng=None):
+        rng = rng or self.rng
+        if self.latency[1]:
+            time.sleep(rng.uniform(*self.latency))
+        words = min(rng.randint(*self.reply_words), int(max_tokens * 0.75))
+        text = ' '.join(rng.choice(('well', 'honestly', 'the', 'deal', 'client', 'I', 'think',
+                                    'pipeline', 'quarter', 'maybe', 'we', 'need', 'to'))
+                        for _ in range(words))
+        prompt = system + ''.join(m['content'] for m in messages)
+        return text, estimate_tokens(prompt), min(max_tokens, estimate_tokens(text))
+
+
+class AnthropicClient:
+    """Thin wrapper over the real Messages API, reporting exact usage."""
+
+    def __init__(self):
+        from anthropic import Anthropic
+        self.client = Anthropic()
+
+    def create(self, model, max_tokens, system, messages, rng=None):
+        response = self.client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            system=system,
+            messages=messages,
+        )
+        return (response.content[0].text,
+                response.usage.input_tokens,
+                response.usage.output_tokens)
+
+
+# ── Simulation ───────────────────────────────
+def simulate_conversation(assignment, client, seed=None):
+    """Play one synthetic student through the scenario.
+
+    The student's lines and (with FakeClient) the replies all come from
+    one generator seeded with `seed`, so a conversation is repeatable
+    whichever thread runs it.
+
+    Returns a list of per-call usage dicts: one per chat turn plus the
+    final evaluation call.
+    """
+    rng      = random.Random(seed)
+    p2       = assignment.get('p2', {})
+    model    = assignment.get('apiModel') or DEFAULT_MODEL
+    system   = p2.get('systemPrompt', '')
+    turns    = p2.get('maxTurns') or DEFAULT_MAX_TURNS
+    messages = []
+    if p2.get('openingMessage'):
+        messages.append({'role': 'assistant', 'content': p2['openingMessage']})
+
+    calls = []
+    for turn in range(turns):
+        messages.append({'role': 'user', 'content': rng.choice(STUDENT_LINES)})
+        start = time.perf_counter()
+        reply, tokens_in, tokens_out = client.create(model, CHAT_MAX_TOKENS, system, messages, rng)
+        calls.append({'turn': turn + 1, 'input': tokens_in, 'output': tokens_out,
+                      'seconds': time.perf_counter() - start})
+        messages.append({'role': 'assistant', 'content': reply})
+
+    transcript = '\n\n'.join(f"{'STUDENT' if m['role'] == 'user' else 'AI'}: {m['content']}"
+                             for m in messages)
+    criteria = p2.get('evaluationCriteria') or []
+    criteria_text = ('\n'.join(f"{i+1}. {c}" for i, c in enumerate(criteria)) if criteria
+                     else EVAL_FALLBACK_CRITERIA)
+    eval_prompt = EVAL_PROMPT.format(criteria=criteria_text, transcript=transcript)
+    start = time.perf_counter()
+    _, tokens_in, tokens_out = client.create(model, EVAL_MAX_TOKENS, EVAL_SYSTEM,
+                                             [{'role': 'user', 'content': eval_prompt}], rng)
+    calls.append({'turn': 'eval', 'input': tokens_in, 'output': tokens_out,
+                  'seconds': time.perf_counter() - start})
+    return calls
+
+
+def cost(tokens_in, tokens_out, model):
+    price_in, price_out = PRICING.get(model, PRICING[DEFAULT_MODEL])
+    return (tokens_in * price_in + tokens_out * price_out) / 1_000_000
+
+
+def run_simulation(assignment, client, conversations=50, workers=16, seed=0):
+    """Run many conversations concurrently and aggregate their usage."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda n: simulate_conversation(assignment, client, seed + n),
+                                range(conversations)))
+
+    model = assignment.get('apiModel') or DEFAULT_MODEL
+    per_turn = {}
+    for calls in results:
+        for c in calls:
+            per_turn.setdefault(c['turn'], []).append(c)
+
+    totals = [sum(c['input'] + c['output'] for c in calls) for calls in results]
+    costs  = [sum(cost(c['input'], c['output'], model) for c in calls) for calls in results]
+    return {
+        'model':         model,
+        'conversations': conversations,
+        'systemTokens':  estimate_tokens(assignment.get('p2', {}).get('systemPrompt', '')),
+        'perTurn': [{
+            'turn':    turn,
+            'input':   statistics.mean(c['input'] for c in calls),
+            'output':  statistics.mean(c['output'] for c in calls),
+            'seconds': statistics.mean(c['seconds'] for c in calls),
+        } for turn, calls in per_turn.items()],
+        'tokensPerConversation': {
+            'mean': statistics.mean(totals),
+            'p95':  sorted(totals)[int(0.95 * (len(totals) - 1))],
+            'max':  max(totals),
+        },
+        'costPerConversation': statistics.mean(costs),
+    }
+
+
+def print_report(report, class_sizes):
+    print(f"\n📊 Part 2 load simulation — {report['model']}, {report['conversations']} conversations")
+    print(f"   System prompt: ~{report['systemTokens']:,} tokens (resent every turn)\n")
+    print(f"   {'Turn':>5}  {'Input':>8}  {'Output':>7}  {'Latency':>8}")
+    for row in report['perTurn']:
+        print(f"   {row['turn']:>5}  {row['input']:>8,.0f}  {row['output']:>7,.0f}  {row['seconds']:>7.2f}s")
+
+    t = report['tokensPerConversation']
+    print(f"\n   Tokens per conversation: mean {t['mean']:,.0f} · p95 {t['p95']:,} · max {t['max']:,}")
+    print(f"   Cost per conversation:   ${report['costPerConversation']:.4f}")
+    print(f"\n   Projected cost per class:")
+    for size in class_sizes:
+        print(f"     {size:>5} students  ${size * report['costPerConversation']:,.2f}")
+    print()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulate Part 2 conversation load for an assignment')
+    parser.add_argument('assignment', help='Assignment JSON file')
+    parser.add_argument('--conversations',     type=int, default=50)
+    parser.add_argument('--workers',           type=int, default=16)
+    parser.add_argument('--class-sizes',       default='25,50,100,200')
+    parser.add_argument('--max-system-tokens', type=int, default=MAX_SYSTEM_TOKENS)
+    parser.add_argument('--seed',              type=int, default=0)
+    parser.add_argument('--live',              action='store_true', help='Use the real Anthropic API')
+    parser.add_argument('--json',              action='store_true', help='Print the raw report as JSON')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.assignment):
+        print(f"❌ File not found: {args.assignment}")
+        sys.exit(1)
+    with open(args.assignment, 'r', encoding='utf-8') as f:
+        assignment = json.load(f)
+
+    client = AnthropicClient() if args.live else FakeClient(seed=args.seed)
+    report = run_simulation(assignment, client, args.conversations, args.workers, args.seed)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, [int(s) for s in args.class_sizes.split(',') if s.strip()])
+
+    if report['systemTokens'] > args.max_system_tokens:
+        print(f"⚠️  System prompt is ~{report['systemTokens']:,} tokens "
+              f"(limit {args.max_system_tokens:,}) — trim it before publishing")
+        sys.exit(1)
@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+
+from artifacts import ArtifactStore
+
+
+def _text(n, lines=400):
+    return ''.join(f"line {i} of block {n}\n" for i in range(lines))
+
+
+def test_round_trip_and_dedup(tmp_path):
+    with ArtifactStore(str(tmp_path)) as store:
+        shared = _text('shared')
+        a = store.put('run1', '6', 'Scholar', 'input', 'header one\n' + shared)
+        b = store.put('run2', '6', 'Scholar', 'input', 'header two\n' + shared)
+
+        assert store.get(a) == 'header one\n' + shared
+        assert store.get(b) == 'header two\n' + shared
+        stats = store.stats()
+        assert stats['blobs'] < 2 * len(shared) // 2048   # most chunks are shared
+
+
+def test_empty_artifact(tmp_path):
+    with ArtifactStore(str(tmp_path)) as store:
+        assert store.get(store.put('run', '6', 'CEO', 'output', '')) == ''
+
+
+def test_concurrent_puts_of_identical_content(tmp_path):
+    store_root = str(tmp_path)
+    ArtifactStore(store_root).close()
+    content = _text('prompt', 2000)
+    errors, ids = [], []
+
+    def worker():
+        try:
+            with ArtifactStore(store_root) as store:
+                ids.append(store.put('run', '6', 'Scholar', 'system', content))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with ArtifactStore(store_root) as store:
+        assert all(store.get(i) == content for i in ids)
+    leftovers = [n for _, _, files in os.walk(tmp_path) for n in files if n.endswith('.tmp')]
+    assert leftovers == []
+
+
+def test_gc_keeps_recent_and_in_progress_blobs(tmp_path):
+    with ArtifactStore(str(tmp_path)) as store:
+        store.put('old', '6', 'CEO', 'output', _text('old'))
+        time.sleep(0.01)
+        new = store.put('new', '6', 'CEO', 'output', _text('new'))
+        tmp = os.path.join(store.blob_dir, 'partial.tmp')
+        open(tmp, 'w').close()
+
+        # Within the grace period nothing unreferenced is swept
+        assert store.gc(keep_runs=1) == (1, 0)
+        removed, swept = store.gc(keep_runs=1, grace=-1)
+        assert swept > 0
+        assert os.path.exists(tmp)
+        assert store.get(new) == _text('new')
+        assert store.list(run_id='old') == []
+
+
+def test_gc_spares_old_blob_reused_by_concurrent_put(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    content = _text('reused')
+    with ArtifactStore(root) as store, ArtifactStore(root) as other:
+        store.put('old', '6', 'CEO', 'output', content)
+        hours_ago = time.time() - 7200
+        for dirpath, _, files in os.walk(store.blob_dir):
+            for name in files:
+                os.utime(os.path.join(dirpath, name), (hours_ago, hours_ago))
+
+        # Another process stores the same content after gc has read its
+        # live set but before it sweeps
+        real_walk, reused = os.walk, []
+
+        def walk(top, *args, **kwargs):
+            if not reused:
+                reused.append(other.put('new', '6', 'CEO', 'output', content))
+            return real_walk(top, *args, **kwargs)
+
+        monkeypatch.setattr(os, 'walk', walk)
+        assert store.gc(keep_runs=0) == (1, 0)
+        monkeypatch.undo()
+
+        assert other.get(reused[0]) == content
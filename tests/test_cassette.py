@@ -0,0 +1,53 @@
+import pytest
+
+from cassette import Cassette, CassetteExhausted
+
+
+def _request(system, user, model='claude-sonnet-4-6'):
+    return {'model': model, 'max_tokens': 8000, 'system': system,
+            'messages': [{'role': 'user', 'content': user}]}
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    path = str(tmp_path / 'run.jsonl')
+    cassette = Cassette(path, 'record')
+    for chapter in ('6', '7'):
+        cassette.record('Scholar', _request('scholar v1', f'chapter {chapter}'), f'scholar {chapter}', chapter)
+        cassette.record('CEO', _request('ceo v1', f'build {chapter}'), f'ceo {chapter}', chapter)
+    return path
+
+
+def test_exact_match_in_any_order(recorded):
+    cassette = Cassette(recorded, 'replay')
+    assert cassette.replay('CEO', _request('ceo v1', 'build 7'), '7') == 'ceo 7'
+    assert cassette.replay('Scholar', _request('scholar v1', 'chapter 6'), '6') == 'scholar 6'
+    assert cassette.drift == []
+
+
+def test_drift_falls_back_within_chapter_and_stage(recorded):
+    cassette = Cassette(recorded, 'replay')
+    # Edited prompt: nothing matches by hash, and chapter 7 asks first
+    assert cassette.replay('Scholar', _request('scholar v2', 'chapter 7'), '7') == 'scholar 7'
+    assert cassette.replay('Scholar', _request('scholar v2', 'chapter 6'), '6') == 'scholar 6'
+    assert cassette.replay('CEO', _request('ceo v1', 'build 6 again'), '6') == 'ceo 6'
+
+    changed = {(d['chapter'], d['stage']): d['changed'] for d in cassette.drift}
+    assert changed == {('7', 'Scholar'): ['system prompt'],
+                       ('6', 'Scholar'): ['system prompt'],
+                       ('6', 'CEO'): ['input']}
+
+
+def test_model_change_is_drift(recorded):
+    cassette = Cassette(recorded, 'replay')
+    cassette.replay('CEO', _request('ceo v1', 'build 6', model='claude-haiku-4-5-20251001'), '6')
+    assert cassette.drift[0]['changed'] == ['model']
+
+
+def test_exhausted(recorded):
+    cassette = Cassette(recorded, 'replay')
+    cassette.replay('CEO', _request('ceo v1', 'build 6'), '6')
+    with pytest.raises(CassetteExhausted):
+        cassette.replay('CEO', _request('ceo v2', 'build 6'), '6')
+    with pytest.raises(CassetteExhausted):
+        cassette.replay('CEO', _request('ceo v2', 'build 8'), '8')
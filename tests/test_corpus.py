@@ -0,0 +1,141 @@
+import json
+import random
+
+import pytest
+
+from corpus import Corpus, Source, load_corpus
+
+
+def _original_extract(book_text, chapter):
+    """The line-by-line extract_chapter that Source.chapter_range replaced."""
+    chapter_str = str(chapter).replace('-', '–')
+    lines = book_text.split('\n')
+    start_idx = None
+    end_idx   = None
+    for i, line in enumerate(lines):
+        line_lower = line.lower().strip()
+        if f'chapter {chapter}' in line_lower or f'chapter {chapter_str}' in line_lower:
+            if start_idx is None:
+                start_idx = i
+        elif start_idx is not None and line_lower.startswith('chapter '):
+            end_idx = i
+            break
+    if start_idx is not None:
+        chapter_lines = lines[start_idx:end_idx] if end_idx else lines[start_idx:start_idx+500]
+        return '\n'.join(chapter_lines)
+    return book_text
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+BOOK = """Sales EQ
+Contents: see Chapter 6 for empathy
+Chapter 5: Ultra-High Performers
+Pipeline discipline.
+CHAPTER 6 — Empathy
+Feel what the buyer feels.
+  Chapter 6 continued
+Stay curious.
+Chapter 7: Listening
+Shut up and listen.
+"""
+
+
+def test_ends_before_next_heading(tmp_path):
+    corpus = Corpus(Source(_write(tmp_path, 'book.txt', BOOK)))
+    text = corpus.extract_chapter(5)
+    assert text == 'Chapter 5: Ultra-High Performers\nPipeline discipline.'
+    # A later heading for the same chapter doesn't end it; the next chapter does
+    corpus = Corpus(Source(_write(tmp_path, 'book2.txt', BOOK.replace('Contents: see Chapter 6 for empathy\n', ''))))
+    assert corpus.extract_chapter(6) == 'CHAPTER 6 — Empathy\nFeel what the buyer feels.\n  Chapter 6 continued\nStay curious.'
+    assert corpus.extract_chapter(7) == 'Chapter 7: Listening\nShut up and listen.\n'
+
+
+def test_first_mention_wins_even_in_contents(tmp_path):
+    # Same as the original scan: a contents line starts the chapter and the
+    # next heading (here the previous chapter) ends it
+    corpus = Corpus(Source(_write(tmp_path, 'book.txt', BOOK)))
+    assert corpus.extract_chapter(6) == 'Contents: see Chapter 6 for empathy'
+
+
+def test_falls_back_to_500_lines_without_next_heading(tmp_path):
+    body = ''.join(f'line {i}\n' for i in range(800))
+    corpus = Corpus(Source(_write(tmp_path, 'book.txt', 'Chapter 9: Closing\n' + body)))
+    lines = corpus.extract_chapter(9).split('\n')
+    assert len(lines) == 500
+    assert lines[0] == 'Chapter 9: Closing' and lines[-1] == 'line 498'
+
+
+def test_range_matches_en_dash(tmp_path):
+    path = _write(tmp_path, 'book.txt', 'Intro\nChapter 11–12: Objections\nTurn them around.\nChapter 13\n')
+    source = Source(path)
+    assert source.extract_chapter('11-12') == 'Chapter 11–12: Objections\nTurn them around.'
+
+
+def test_missing_chapter_returns_whole_book(tmp_path):
+    corpus = Corpus(Source(_write(tmp_path, 'book.txt', BOOK)))
+    assert corpus.book.extract_chapter(42) is None
+    assert corpus.extract_chapter(42) == BOOK
+
+
+def test_empty_file(tmp_path):
+    source = Source(_write(tmp_path, 'book.txt', ''))
+    assert source.size == 0
+    assert source.extract_chapter(6) is None
+    assert Corpus(source).extract_chapter(6) == ''
+    assert source.head(100) == ''
+
+
+def test_matches_original_extraction_on_random_books(tmp_path):
+    rng = random.Random(31)
+    pieces = ['Chapter 1', 'chapter 11 recap', 'Chapter 11-12', 'Chapter 11–12: Range', '  CHAPTER 2',
+              'see chapter 2 later', 'Chapters overview', 'chapter', 'plain text', 'émotions — €', '']
+    for n in range(200):
+        text = '\n'.join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+        if rng.random() < 0.5:
+            text += '\n'
+        source = Source(_write(tmp_path, f'book{n}.txt', text))
+        for chapter in ('1', '2', '11', '11-12'):
+            assert Corpus(source).extract_chapter(chapter) == _original_extract(text, chapter), (text, chapter)
+        source.close()
+
+
+def test_directory_corpus(tmp_path):
+    _write(tmp_path, 'course/a_notes.md', 'Chapter 6 notes: ask better questions\n')
+    _write(tmp_path, 'course/book.txt', BOOK)
+    _write(tmp_path, 'course/case_study.txt', 'Chapter 9 only\n')
+    _write(tmp_path, 'course/ignored.pdf', 'Chapter 6')
+
+    corpus = load_corpus(str(tmp_path / 'course'))
+    assert corpus.book.label == 'book'
+    assert [s.label for s in corpus.supplements] == ['a notes', 'case study']
+    assert corpus.supplementary(6) == [('a notes', 'Chapter 6 notes: ask better questions\n')]
+    assert load_corpus(str(tmp_path / 'course')) is corpus
+
+
+def test_json_config_corpus(tmp_path):
+    _write(tmp_path, 'texts/sales_eq.txt', BOOK)
+    _write(tmp_path, 'notes/instructor.md', 'Chapter 7: pause before answering\n')
+    _write(tmp_path, 'cases/acme.txt', 'Chapter 7 case: Acme\n')
+    _write(tmp_path, 'cases/globex.txt', 'Chapter 5 case: Globex\n')
+    config = _write(tmp_path, 'bus370.json', json.dumps({
+        'name': 'BUS 370',
+        'book': 'texts/sales_eq.txt',
+        'sources': ['notes/instructor.md', {'path': 'cases/', 'label': 'Case studies'}],
+    }))
+
+    corpus = load_corpus(config)
+    assert corpus.name == 'BUS 370'
+    assert corpus.extract_chapter(7).startswith('Chapter 7: Listening')
+    assert [label for label, _ in corpus.supplementary(7)] == ['instructor', 'Case studies — acme.txt']
+
+
+def test_empty_directory_is_an_error(tmp_path):
+    (tmp_path / 'empty').mkdir()
+    with pytest.raises(FileNotFoundError):
+        load_corpus(str(tmp_path / 'empty'))
@@ -0,0 +1,83 @@
+import json
+import threading
+import time
+
+import pytest
+
+from deadlines import (Deadline, RunResult, StageCancelled, StageTimeout, StageFailed,
+                       parse_stage_timeouts)
+
+
+def test_parse_stage_timeouts():
+    assert parse_stage_timeouts(['180', 'CEO=300', 'ai_analyst=120.5']) == \
+        {'*': 180.0, 'CEO': 300.0, 'ai_analyst': 120.5}
+    assert parse_stage_timeouts(None) == {}
+
+
+@pytest.mark.parametrize('value, message', [
+    ('Scholr=5', 'unknown stage'),
+    ('CEO=5m',   'not a number'),
+    ('0',        'must be positive'),
+])
+def test_parse_stage_timeouts_rejects_bad_values(value, message):
+    with pytest.raises(ValueError, match=message):
+        parse_stage_timeouts([value])
+
+
+def test_stage_limit_overrides_default_and_matches_loosely():
+    deadline = Deadline({'*': 100, 'ai_analyst': 30})
+    assert deadline.timeout_for('AI Analyst') == 30
+    assert deadline.timeout_for('Scholar') == 100
+    assert Deadline().timeout_for('CEO') is None
+
+
+def test_stage_budget_counts_time_already_spent():
+    deadline = Deadline({'CEO': 10})
+    assert 7 < deadline.timeout_for('CEO', started=time.monotonic() - 2.5) <= 7.5
+    with pytest.raises(StageTimeout, match='stage deadline'):
+        deadline.timeout_for('CEO', started=time.monotonic() - 11)
+
+
+def test_run_budget_caps_stage_limit():
+    deadline = Deadline({'*': 100}, run_timeout=20)
+    assert 19 < deadline.timeout_for('Scholar') <= 20
+    deadline.started -= 21
+    with pytest.raises(StageTimeout, match='run deadline'):
+        deadline.timeout_for('Scholar')
+
+
+def test_cancel_is_shared_across_deadlines():
+    cancel = threading.Event()
+    first, second = Deadline(cancel=cancel), Deadline(cancel=cancel)
+    cancel.set()
+    for deadline in (first, second):
+        with pytest.raises(StageCancelled):
+            deadline.timeout_for('Visionary')
+
+
+def test_stop_cancels_later_stages_and_flush_keeps_outputs(tmp_path):
+    output = str(tmp_path / 'assignment_ch6.json')
+    result = RunResult('6', output)
+    assert result.flush() is None
+
+    result.complete('Scholar', {'concepts': ['empathy']})
+    result.stop('Visionary', 'timed_out', StageTimeout('Visionary', 'no response'))
+    assert result.stages == {'Scholar': 'ok', 'Visionary': 'timed_out',
+                             'AI Analyst': 'cancelled', 'CEO': 'cancelled'}
+    assert not result.ok
+
+    saved = result.flush()
+    assert saved == str(tmp_path / 'assignment_ch6.partial.json')
+    with open(saved, encoding='utf-8') as f:
+        partial = json.load(f)
+    assert partial['outputs'] == {'Scholar': {'concepts': ['empathy']}}
+    assert partial['error'] == 'Visionary: no response'
+
+
+def test_pending_stage_and_error_status():
+    result = RunResult('7', 'out.json')
+    result.complete('Scholar', 'x')
+    assert result.pending_stage() == 'Visionary'
+    error = StageFailed(result.pending_stage(), 'boom')
+    result.stop(error.stage, error.status, error)
+    assert result.stages['Visionary'] == 'failed'
@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+
+from limiter import AdaptiveLimiter, FakeOverloaded, FakeServer, SlotCancelled, SlotTimeout
+
+
+def _limiter(**kwargs):
+    return AdaptiveLimiter(log=lambda message: None, **kwargs)
+
+
+def _saturate(limiter, model='m'):
+    """Fill every slot at the current limit so each finish counts as saturated."""
+    def fill(n):
+        if n:
+            with limiter.slot(model):
+                fill(n - 1)
+    fill(limiter.limit(model))
+
+
+def test_overload_halves_limit_down_to_minimum():
+    limiter = _limiter(initial=8, minimum=2)
+    for expected in (4, 2, 2):
+        with pytest.raises(FakeOverloaded):
+            with limiter.slot('m'):
+                raise FakeOverloaded()
+        assert limiter.limit('m') == expected
+
+
+def test_other_errors_leave_limit_alone():
+    limiter = _limiter(initial=4)
+    with pytest.raises(ValueError):
+        with limiter.slot('m'):
+            raise ValueError()
+    assert limiter.limit('m') == 4
+
+
+def test_latency_spike_per_token_halves_limit():
+    limiter = _limiter(initial=4)
+    with limiter.slot('m') as slot:
+        time.sleep(0.01)
+        slot.tokens = 100
+    assert limiter.limit('m') == 4
+    # Same wall time for one token is 100× slower per token
+    with limiter.slot('m') as slot:
+        time.sleep(0.01)
+        slot.tokens = 1
+    assert limiter.limit('m') == 2
+
+
+def test_grows_only_when_saturated_and_up_to_maximum():
+    limiter = _limiter(initial=2, maximum=4, spike=float('inf'))
+    for _ in range(10):
+        with limiter.slot('m'):
+            pass
+    assert limiter.limit('m') == 2
+
+    _saturate(limiter)
+    _saturate(limiter)
+    assert limiter.limit('m') == 3
+    for _ in range(20):
+        _saturate(limiter)
+    assert limiter.limit('m') == 4
+
+
+def test_starting_limit_respects_lowered_maximum():
+    limiter = _limiter(initial=2)
+    limiter.maximum = 1
+    assert limiter.limit('m') == 1
+    with limiter.slot('m'):
+        with pytest.raises(SlotTimeout):
+            with limiter.slot('m', timeout=0.05):
+                pass
+
+
+def test_models_are_limited_separately():
+    limiter = _limiter(initial=4)
+    with pytest.raises(FakeOverloaded):
+        with limiter.slot('a'):
+            raise FakeOverloaded()
+    assert (limiter.limit('a'), limiter.limit('b')) == (2, 4)
+
+
+def test_slot_wait_times_out():
+    limiter = _limiter(initial=1)
+    with limiter.slot('m'):
+        start = time.monotonic()
+        with pytest.raises(SlotTimeout):
+            with limiter.slot('m', timeout=0.05):
+                pass
+        assert time.monotonic() - start < 1
+    # The failed wait didn't take a slot
+    with limiter.slot('m', timeout=0.05):
+        pass
+
+
+def test_slot_wait_wakes_on_cancel():
+    limiter = _limiter(initial=1)
+    cancel = threading.Event()
+    with limiter.slot('m'):
+        threading.Timer(0.05, cancel.set).start()
+        start = time.monotonic()
+        with pytest.raises(SlotCancelled):
+            with limiter.slot('m', cancel=cancel):
+                pass
+        assert time.monotonic() - start < 1
+
+
+def test_settles_below_overload_on_fake_server():
+    server  = FakeServer(capacity=4, calls=200)
+    limiter = _limiter(maximum=16)
+    errors  = []
+
+    def worker():
+        for _ in range(200 // 16):
+            try:
+                with limiter.slot('m'):
+                    server.call()
+            except FakeOverloaded as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # The server 529s past twice its capacity; the limit must stay under that
+    assert 1 <= limiter.limit('m') <= 2 * server.capacity
+    assert len(errors) < 10
@@ -0,0 +1,53 @@
+import pytest
+
+from question_index import QuestionIndex, chapter_key
+
+
+def _assignment(slug, *questions):
+    return {'slug': slug, 'p1': {'questions': [
+        {'id': f'q{n + 1}', 'text': text, 'options': []} for n, text in enumerate(questions)]}}
+
+
+QUESTION = "Which listening technique best uncovers the buyer's unstated emotional needs?"
+OTHER    = "What is the main purpose of a mutual action plan in a complex enterprise deal?"
+
+
+@pytest.fixture
+def index():
+    with QuestionIndex(':memory:') as index:
+        yield index
+
+
+def test_chapter_key_matches_published_slugs():
+    assert chapter_key(6) == 'ch6'
+    assert chapter_key('11-12') == chapter_key('11–12') == 'ch11_12'
+
+
+def test_reindex_under_same_key_replaces_old_draft(index):
+    # Each run the model picks a new slug; the chapter key stays the same
+    index.add_assignment(_assignment('empathy_draft_ch6', QUESTION, OTHER), key='ch6')
+    index.add_assignment(_assignment('listening_wins_ch6', QUESTION), key='ch6')
+    assert len(index) == 1
+    assert index.find_duplicates(_assignment('third_try_ch6', QUESTION), key='ch6') == []
+
+
+def test_slug_key_by_default(index):
+    assert index.add_assignment(_assignment('ch6', QUESTION, OTHER)) == 2
+    assert index.add_assignment(_assignment('ch6', OTHER)) == 1
+    assert len(index) == 1
+
+
+def test_duplicates_exclude_own_key_only(index):
+    index.add_assignment(_assignment('ch6', QUESTION), key='ch6')
+    index.add_assignment(_assignment('ch7', OTHER), key='ch7')
+
+    flagged = index.find_duplicates(_assignment('new_slug', QUESTION, OTHER), key='ch7')
+    assert [(qid, [m['slug'] for m in matches]) for qid, matches in flagged] == [('q1', ['ch6'])]
+    assert flagged[0][1][0]['similarity'] == 1.0
+
+
+def test_wordless_questions_are_skipped(index):
+    assert index.add_assignment(_assignment('ch6', '???', '', QUESTION), key='ch6') == 1
+    assert index.query('?!') == []
+    # Two wordless questions must not match each other
+    assert index.find_duplicates(_assignment('ch7', '...', '—'), key='ch7') == []
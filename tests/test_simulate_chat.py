@@ -0,0 +1,43 @@
+import json
+import os
+
+import pytest
+
+from simulate_chat import EVAL_MAX_TOKENS, FakeClient, run_simulation, simulate_conversation
+
+ASSIGNMENT = os.path.join(os.path.dirname(__file__), '..', 'public', 'assignments', 'ch6.json')
+
+
+@pytest.fixture(scope='module')
+def assignment():
+    with open(ASSIGNMENT, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _totals(report):
+    return report['tokensPerConversation'], report['costPerConversation']
+
+
+def test_seeded_runs_repeat_across_threads(assignment):
+    reports = [run_simulation(assignment, FakeClient(seed=0), conversations=40, workers=w, seed=3)
+               for w in (1, 8, 16)]
+    assert _totals(reports[0]) == _totals(reports[1]) == _totals(reports[2])
+    assert _totals(run_simulation(assignment, FakeClient(), conversations=40, seed=4)) != _totals(reports[0])
+
+
+def test_conversation_sends_full_history_then_evaluates(assignment):
+    calls = simulate_conversation(assignment, FakeClient(), seed=1)
+    turns = assignment['p2'].get('maxTurns') or 12
+    assert [c['turn'] for c in calls] == list(range(1, turns + 1)) + ['eval']
+    # Every turn resends the whole conversation, so input only grows
+    inputs = [c['input'] for c in calls[:-1]]
+    assert inputs == sorted(inputs) and len(set(inputs)) == len(inputs)
+    assert calls[-1]['output'] <= EVAL_MAX_TOKENS
+
+
+def test_report_shape(assignment):
+    report = run_simulation(assignment, FakeClient(), conversations=5, seed=0)
+    assert report['conversations'] == 5
+    t = report['tokensPerConversation']
+    assert t['mean'] <= t['max'] and t['p95'] <= t['max']
+    assert report['costPerConversation'] > 0